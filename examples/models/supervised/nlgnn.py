@@ -11,8 +11,12 @@ from greatx.utils import split_nodes
 
 dataset = 'Cora'
 root = osp.join(osp.dirname(osp.realpath(__file__)), '../../..', 'data')
-dataset = GraphDataset(root=root, name=dataset,
-                       transform=T.LargestConnectedComponents())
+# normalization is topology-only, so run it once on CPU at load time
+# instead of on the fly in every forward pass
+dataset = GraphDataset(
+    root=root, name=dataset,
+    transform=T.Compose([T.LargestConnectedComponents(),
+                         T.GCNNorm()]))
 
 data = dataset[0]
 splits = split_nodes(data.y, train=0.6, val=0.2, test=0.2, random_state=15)
@@ -23,7 +27,9 @@ num_classes = data.y.max().item() + 1
 device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
 method = "NLGCN"
 if method == "NLGCN":
-    model = NLGCN(num_features, num_classes)
+    # the graph is already normalized by `T.GCNNorm` above
+    model = NLGCN(num_features, num_classes, normalize=False,
+                  add_self_loops=False)
 elif method == "NLMLP":
     model = NLMLP(num_features, num_classes)
 else:
@@ -24,6 +24,7 @@ class BackdoorAttacker(Attacker):
         """
         self.num_budgets = None
         self._trigger = None
+        self._cached_x = None
         self._is_reset = True
 
         return self
@@ -72,13 +73,23 @@ class BackdoorAttacker(Attacker):
         -------
         Data
             the attacked graph with backdoor attack performed on the target node
+
+        Note
+        ----
+        Since the trigger node is invariant across target nodes, the
+        augmented feature matrix is cached and reused for repeated
+        queries; the cache is cleared by :meth:`reset`.
         """
         data = copy(self.ori_data)
         num_nodes = self.num_nodes
-        feat = self.trigger().view(1, -1)
+
+        if self._cached_x is None:
+            feat = self.trigger().view(1, -1)
+            self._cached_x = torch.cat([data.x, feat], dim=0)
+        data.x = self._cached_x
+
         edges_to_add = torch.tensor([num_nodes, target_node]).view(
             2, 1).to(data.edge_index)
-        data.x = torch.cat([data.x, feat], dim=0)
         data.edge_index = add_edges(
             data.edge_index, edges_to_add, symmetric=symmetric)
 
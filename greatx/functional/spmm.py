@@ -87,8 +87,13 @@ def spmm(x: Tensor, edge_index: Union[Tensor, SparseTensor],
         assert reduce in ['sum', 'add', 'mean', 'min', 'max']
         return matmul(edge_index, x, reduce)
 
-    # Case 2: `torch.sparse.Tensor` (Sparse) and `torch.FloatTensor` (Dense)
+    # Case 2: `torch.sparse.Tensor` (COO/CSR) and `torch.FloatTensor` (Dense)
+    # NOTE: a CSR input hits the optimized `spmm` kernel of
+    # `torch.sparse.mm`, which is considerably faster than the COO
+    # scatter path, particularly on CPU.
     if isinstance(edge_index, Tensor) and (edge_index.is_sparse
+                                           or edge_index.layout
+                                           == torch.sparse_csr
                                            or edge_index.dtype == torch.float):
         assert reduce in ['sum', 'add']
         return torch.sparse.mm(edge_index, x)
@@ -26,6 +26,34 @@ def dense_gcn_norm(adj: Tensor, improved: bool = False,
     return adj
 
 
+if hasattr(torch, 'compile'):  # PyTorch >= 2.0
+    # The dense normalization is a chain of elementwise ops and
+    # reductions that the compiler can fuse into a single kernel,
+    # avoiding several full passes over the adjacency matrix.
+    # `torch.compile` itself raises when the running Python version is
+    # newer than Dynamo supports, while backend errors (e.g. a missing
+    # C++ toolchain or Triton) only surface at the first invocation, so
+    # guard the wrap call and dispatch through a wrapper that
+    # permanently falls back to the eager function if that call fails.
+    _eager_dense_gcn_norm = dense_gcn_norm
+    try:
+        _dense_gcn_norm_impl = torch.compile(dense_gcn_norm, dynamic=False)
+    except Exception:  # pragma: no cover
+        _dense_gcn_norm_impl = _eager_dense_gcn_norm
+
+    def dense_gcn_norm(adj: Tensor, improved: bool = False,
+                       add_self_loops: bool = True,
+                       rate: float = -0.5) -> Tensor:
+        global _dense_gcn_norm_impl
+        if _dense_gcn_norm_impl is _eager_dense_gcn_norm:
+            return _dense_gcn_norm_impl(adj, improved, add_self_loops, rate)
+        try:
+            return _dense_gcn_norm_impl(adj, improved, add_self_loops, rate)
+        except Exception:  # pragma: no cover
+            _dense_gcn_norm_impl = _eager_dense_gcn_norm
+            return _dense_gcn_norm_impl(adj, improved, add_self_loops, rate)
+
+
 def dense_add_self_loops(adj: Tensor, fill_value: float = 1.0) -> Tensor:
     diag = torch.diag(adj.new_full((adj.size(0), ), fill_value))
     return adj + diag
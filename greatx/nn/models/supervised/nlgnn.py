@@ -33,6 +33,14 @@ class NLGCN(nn.Module):
     bn: bool, optional
         whether to use :class:`BatchNorm1d` after the convolution layer,
         by default False
+    normalize : bool, optional
+        whether to compute symmetric normalization
+        coefficients on the fly, by default True
+    add_self_loops : bool, optional
+        whether to add self-loops to the input graph, by default True.
+        Set both :obj:`normalize` and :obj:`add_self_loops` to
+        :obj:`False` if the graph is already preprocessed with
+        :class:`torch_geometric.transforms.GCNNorm`.
 
 
 
@@ -64,14 +72,16 @@ class NLGCN(nn.Module):
     def __init__(self, in_channels: int, out_channels: int,
                  hids: List[int] = [16], acts: List[str] = ['relu'],
                  kernel: int = 5, dropout: float = 0.5, bn: bool = False,
-                 normalize: bool = True, bias: bool = True):
+                 normalize: bool = True, add_self_loops: bool = True,
+                 bias: bool = True):
 
         super().__init__()
         conv = []
         assert len(hids) == len(acts)
         for hid, act in zip(hids, acts):
             conv.append(
-                GCNConv(in_channels, hid, bias=bias, normalize=normalize))
+                GCNConv(in_channels, hid, bias=bias, normalize=normalize,
+                        add_self_loops=add_self_loops))
             if bn:
                 conv.append(nn.BatchNorm1d(hid))
             conv.append(activations.get(act))
@@ -79,7 +89,8 @@ class NLGCN(nn.Module):
             in_channels = hid
 
         conv.append(
-            GCNConv(in_channels, out_channels, bias=bias, normalize=normalize))
+            GCNConv(in_channels, out_channels, bias=bias, normalize=normalize,
+                    add_self_loops=add_self_loops))
         self.conv = Sequential(*conv)
 
         self.proj = nn.Linear(out_channels, 1)
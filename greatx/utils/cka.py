@@ -1,5 +1,5 @@
 from functools import partial
-from typing import Dict, List
+from typing import Dict, List, Sequence, Tuple, Union
 from warnings import warn
 
 import torch
@@ -99,6 +99,14 @@ class CKA:
             # ignore those features that dimensions not equal to 2
             return
 
+        out = out.detach()
+        if out.is_cuda:
+            # The whole forward trace of both models is held in memory
+            # until `compare` finishes; activations are only consumed
+            # through FP32 reductions there, so BF16 storage halves the
+            # resident size and memory bandwidth on GPU.
+            out = out.to(torch.bfloat16)
+
         if model == "model1":
             self.model1_features[name] = out
         elif model == "model2":
@@ -107,98 +115,215 @@ class CKA:
             raise RuntimeError(f"Unknown model name `{model}`.")
 
     def _insert_hooks(self):
-
-        # Model 1
-        for name, layer in self.model1.named_modules():
-            if self.model1_layers is not None:
-                if name in self.model1_layers:
-                    self.model1_info['Layers'] += [name]
-                    layer.register_forward_hook(
-                        partial(self._log_layer, "model1", name))
+        self._handles = []
+
+        for key, model, layers, info in (
+            ("model1", self.model1, self.model1_layers, self.model1_info),
+            ("model2", self.model2, self.model2_layers, self.model2_info),
+        ):
+            if layers is not None:
+                # Look the whitelisted layers up directly, which is
+                # O(len(layers)) instead of a full named_modules() walk.
+                named = ((name, model.get_submodule(name))
+                         for name in layers)
             else:
-                self.model1_info['Layers'] += [name]
-                layer.register_forward_hook(
-                    partial(self._log_layer, "model1", name))
-
-        # Model 2
-        for name, layer in self.model2.named_modules():
-            if self.model2_layers is not None:
-                if name in self.model2_layers:
-                    self.model2_info['Layers'] += [name]
+                # Containers simply dispatch to their children, so
+                # hooking them would capture identical activations twice.
+                named = ((name, layer)
+                         for name, layer in model.named_modules()
+                         if len(list(layer.children())) == 0)
+
+            for name, layer in named:
+                info['Layers'] += [name]
+                self._handles.append(
                     layer.register_forward_hook(
-                        partial(self._log_layer, "model2", name))
-            else:
-                self.model2_info['Layers'] += [name]
-                layer.register_forward_hook(
-                    partial(self._log_layer, "model2", name))
+                        partial(self._log_layer, key, name)))
+
+    def close(self):
+        """Remove all registered forward hooks from both models."""
+        for handle in getattr(self, '_handles', []):
+            handle.remove()
+        self._handles = []
+
+    def __del__(self):
+        self.close()
 
-    def _HSIC(self, K, L):
+    def _HSIC(self, K: Tensor, L: Tensor) -> Tensor:
         """Computes the unbiased estimate of HSIC metric.
         Reference: https://arxiv.org/pdf/2010.15327.pdf Eq (3)
+
+        The result is returned as a 0-d tensor on the input device;
+        callers should avoid calling :meth:`Tensor.item` on it inside
+        hot loops, as that forces a host-device synchronization.
+
+        The diagonal contributions the estimator discards are folded in
+        algebraically, so ``K`` and ``L`` are taken as raw Gram
+        matrices -- no in-place ``fill_diagonal_`` is required and both
+        matrices can be reused across calls uncorrupted.
         """
         N = K.shape[0]
-        ones = torch.ones(N, 1).to(self.device)
-        result = torch.trace(K @ L)
-        result += ((ones.t() @ K @ ones @ ones.t() @ L @ ones) /
-                   ((N - 1) * (N - 2))).item()
-        result -= ((ones.t() @ K @ L @ ones) * 2 / (N - 2)).item()
-        result = (1 / (N * (N - 3)) * result).item()
-        return result
+        dK = K.diagonal()
+        dL = L.diagonal()
+        # For symmetric K and L, tr(KL) = (K*L).sum() and the
+        # `ones`-sandwiched products reduce to plain row/column sums,
+        # so no N x N matmul is required here.
+        result = (K * L).sum() - dK @ dL
+        result += ((K.sum() - dK.sum()) * (L.sum() - dL.sum()) /
+                   ((N - 1) * (N - 2)))
+        result -= ((K.sum(0) - dK) @ (L.sum(1) - dL)) * 2 / (N - 2)
+        return result / (N * (N - 3))
+
+    @staticmethod
+    def _gram_stats(feat: Tensor) -> Tuple[Tensor, Tensor, Tensor, Tensor]:
+        """Sufficient statistics of the diagonal-zeroed Gram matrix
+        :math:`K = XX^T`, computed in feature space without ever
+        materializing the :math:`n \\times n` matrix."""
+        # upcast (possibly BF16-stored) activations for the reductions
+        X = feat.flatten(1).float()
+        diag = (X * X).sum(1)
+        rowsum = X @ X.sum(0) - diag
+        return X, diag, rowsum, rowsum.sum()
+
+    def _batch_HSIC(
+        self, stats1: List[Tuple[Tensor, Tensor, Tensor, Tensor]],
+        stats2: List[Tuple[Tensor, Tensor, Tensor, Tensor]]
+    ) -> Tensor:
+        """Batched version of :meth:`_HSIC` that computes the estimator
+        for all layer pairs in one shot from the feature-space
+        statistics of :meth:`_gram_stats`, using the identity
+        :math:`tr(KL) = \\|X^T Y\\|_F^2` so the cost per pair is
+        :math:`O(n d_x d_y)` instead of :math:`O(n^2 d)`.
+
+        Parameters
+        ----------
+        stats1 : List[Tuple[Tensor, Tensor, Tensor, Tensor]]
+            per-layer Gram statistics of model 1
+        stats2 : List[Tuple[Tensor, Tensor, Tensor, Tensor]]
+            per-layer Gram statistics of model 2
+
+        Returns
+        -------
+        Tensor
+            the pairwise HSIC matrix of shape [L1, L2]
+        """
+        n = stats1[0][0].shape[0]
+        trKL = torch.empty(len(stats1), len(stats2), device=self.device)
+        for i, (X, dK, _, _) in enumerate(stats1):
+            for j, (Y, dL, _, _) in enumerate(stats2):
+                trKL[i, j] = (X.t() @ Y).pow_(2).sum() - dK @ dL
+
+        sums1 = torch.stack([s for *_, s in stats1])
+        sums2 = torch.stack([s for *_, s in stats2])
+        rows1 = torch.stack([r for _, _, r, _ in stats1])
+        rows2 = torch.stack([r for _, _, r, _ in stats2])
+
+        result = trKL + torch.outer(sums1, sums2) / ((n - 1) * (n - 2))
+        result -= (rows1 @ rows2.t()) * 2 / (n - 2)
+        return result / (n * (n - 3))
+
+    def _self_HSIC(
+            self, stats: List[Tuple[Tensor, Tensor, Tensor,
+                                    Tensor]]) -> Tensor:
+        """Per-layer HSIC(K, K), i.e. the diagonal of
+        :meth:`_batch_HSIC` of a model with itself, computed in O(L)
+        instead of materializing the full L x L pairwise matrix.
+
+        Parameters
+        ----------
+        stats : List[Tuple[Tensor, Tensor, Tensor, Tensor]]
+            per-layer Gram statistics of :meth:`_gram_stats`
+
+        Returns
+        -------
+        Tensor
+            the per-layer self-HSIC vector of shape [L]
+        """
+        n = stats[0][0].shape[0]
+        result = torch.stack([(X.t() @ X).pow_(2).sum() - dK @ dK
+                              for X, dK, _, _ in stats])
+        result += torch.stack([s for *_, s in stats]).pow(2) / ((n - 1) *
+                                                                (n - 2))
+        result -= torch.stack([r @ r for _, _, r, _ in stats]) * 2 / (n - 2)
+        return result / (n * (n - 3))
 
     @torch.no_grad()
-    def compare(self, data1: Data, data2: Data = None) -> None:
+    def compare(self, data1: Union[Data, Sequence[Data]],
+                data2: Union[Data, Sequence[Data]] = None) -> None:
         """
         Computes the feature similarity between the models on the
         given datasets.
 
         Parameters
         ----------
-        data1 : Data
-            the dataset where model 1 run on.
-        data2 : Data, optional
+        data1 : Data or Sequence[Data]
+            the dataset where model 1 run on. A sequence of
+            :class:`Data` objects is treated as mini-batches whose
+            HSIC contributions are accumulated online with the
+            minibatch estimator (Eq (2) of the referenced paper), so
+            peak memory stays at one batch of activations.
+        data2 : Data or Sequence[Data], optional
             If given, model 2 will run on this dataset. by default None
         """
-        data1.to(self.device)
+        if isinstance(data1, Data):
+            data1 = [data1]
         if data2 is None:
             warn("Data for Model 2 is not given. "
                  "Using the same data for both models.")
             data2 = data1
-        else:
-            data2 = data2.to(self.device)
-
-        self.model1_features = {}
-        self.model2_features = {}
-
-        self.model1(data1.x, data1.edge_index, data1.edge_weight)
-        self.model2(data2.x, data2.edge_index, data2.edge_weight)
-
-        N = len(self.model1_layers) if self.model1_layers is not None else len(
-            self.model1_features)
-        M = len(self.model2_layers) if self.model2_layers is not None else len(
-            self.model2_features)
-        num_batches = 1
-
-        self.hsic_matrix = torch.zeros(N, M, 3)
-
-        for i, (name1, feat1) in enumerate(self.model1_features.items()):
-            X = feat1.flatten(1)
-            K = X @ X.t()
-            K.fill_diagonal_(0.0)
-            self.hsic_matrix[i, :, 0] += self._HSIC(K, K) / num_batches
-
-            for j, (name2, feat2) in enumerate(self.model2_features.items()):
-                Y = feat2.flatten(1)
-                L = Y @ Y.t()
-                L.fill_diagonal_(0)
-                if K.shape != L.shape:
-                    raise RuntimeError(
-                        f"Feature shape mistach! {K.shape} and {L.shape}")
-
-                self.hsic_matrix[i, j, 1] += self._HSIC(K, L) / num_batches
-                self.hsic_matrix[i, j, 2] += self._HSIC(L, L) / num_batches
-        self.hsic_matrix = self.hsic_matrix[:, :, 1] / (
-            self.hsic_matrix[:, :, 0].sqrt() *
-            self.hsic_matrix[:, :, 2].sqrt())
+        elif isinstance(data2, Data):
+            data2 = [data2]
+
+        if len(data1) != len(data2):
+            raise RuntimeError(
+                f"Number of batches mismatch! {len(data1)} and {len(data2)}")
+
+        num_batches = len(data1)
+        self.hsic_matrix = None
+
+        for batch1, batch2 in zip(data1, data2):
+            batch1.to(self.device)
+            if batch2 is not batch1:
+                batch2.to(self.device)
+
+            self.model1_features = {}
+            self.model2_features = {}
+
+            self.model1(batch1.x, batch1.edge_index, batch1.edge_weight)
+            if self.model2 is not self.model1 or batch2 is not batch1:
+                self.model2(batch2.x, batch2.edge_index, batch2.edge_weight)
+            # otherwise both sets of hooks live on the very same
+            # modules, so the forward pass above already populated
+            # `model2_features` and a second forward would be wasted
+
+            stats1 = [
+                self._gram_stats(feat)
+                for feat in self.model1_features.values()
+            ]
+            stats2 = [
+                self._gram_stats(feat)
+                for feat in self.model2_features.values()
+            ]
+
+            if stats1[0][0].shape[0] != stats2[0][0].shape[0]:
+                raise RuntimeError(
+                    f"Feature shape mistach! {stats1[0][0].shape} "
+                    f"and {stats2[0][0].shape}")
+
+            if self.hsic_matrix is None:
+                self.hsic_matrix = torch.zeros(len(stats1), len(stats2), 3,
+                                               device=self.device)
+
+            self.hsic_matrix[..., 0] += self._self_HSIC(stats1).view(
+                -1, 1) / num_batches
+            self.hsic_matrix[..., 1] += self._batch_HSIC(stats1,
+                                                         stats2) / num_batches
+            self.hsic_matrix[..., 2] += self._self_HSIC(stats2).view(
+                1, -1) / num_batches
+        # the single device-to-host transfer; everything above
+        # dispatches asynchronously without intermediate syncs
+        self.hsic_matrix = (self.hsic_matrix[:, :, 1] /
+                            (self.hsic_matrix[:, :, 0].sqrt() *
+                             self.hsic_matrix[:, :, 2].sqrt())).cpu()
 
         assert not torch.isnan(
             self.hsic_matrix).any(), "HSIC computation resulted in NANs"